@@ -0,0 +1,86 @@
+# Character lookup tables shared by the language specific cleaners and tokenizers:
+# lazily filled str.translate tables and per-code-point script masks.
+# Imported in ur_utils.py, zh_utils.py and hi_utils.py
+
+import re
+import unicodedata
+from typing import Callable, List, Tuple
+
+
+class LazyTranslationTable(dict):
+    """
+    A str.translate table that works out the mapping of each code point the first time it is seen.
+
+    str.translate looks every character up in the table from C. Known code points are plain dict
+    hits; unknown ones fall through to __missing__, which runs the rule once and stores the result.
+    This lets a table cover all of Unicode while only ever holding the characters of the corpus.
+
+    Attributes:
+        rule (Callable[[int], str]): Maps a code point to its replacement ('' deletes it).
+    """
+
+    def __init__(self, rule: Callable[[int], str]) -> None:
+        """
+        Initialize the table with the rule used to fill it.
+
+        Args:
+            rule (Callable[[int], str]): Maps a code point to its replacement ('' deletes it).
+        """
+        super().__init__()
+        self.rule = rule
+
+    def __missing__(self, codepoint: int) -> str:
+        """
+        Compute, store and return the replacement for a code point not seen before.
+
+        Args:
+            codepoint (int): The code point being translated.
+
+        Returns:
+            str: The replacement for the code point.
+        """
+        replacement = self.rule(codepoint)
+        self[codepoint] = replacement
+        return replacement
+
+
+def build_script_mask(ranges: List[Tuple[int, int]], category: str = 'Lo') -> bytearray:
+    """
+    Build a lookup table marking the code points of a script.
+
+    The table is indexed by code point, so checking a character costs a single bytearray index
+    instead of a unicodedata call and a scan over the ranges.
+
+    Args:
+        ranges (List[Tuple[int, int]]): Inclusive (start, end) code point ranges of the script.
+        category (str): Unicode general category a code point must also have (default is 'Lo').
+
+    Returns:
+        bytearray: 0x110000 entries, 1 for code points in the ranges with the given category, 0 otherwise.
+    """
+    mask = bytearray(0x110000)
+    for start, end in ranges:
+        for codepoint in range(start, end + 1):
+            if unicodedata.category(chr(codepoint)) == category:
+                mask[codepoint] = 1
+    return mask
+
+
+def mask_char_class(mask: bytearray) -> str:
+    """
+    Turn a script mask into a regex character class matching the same code points.
+
+    Args:
+        mask (bytearray): A table built by build_script_mask.
+
+    Returns:
+        str: The regex source of the class, with consecutive code points packed into ranges.
+    """
+    parts: List[str] = []
+    codepoint = mask.find(1)
+    while codepoint != -1:
+        end = mask.find(0, codepoint)
+        end = len(mask) if end == -1 else end
+        parts.append(re.escape(chr(codepoint)) + '-' + re.escape(chr(end - 1)))
+        codepoint = mask.find(1, end)
+    return '[' + ''.join(parts) + ']'
@@ -1,9 +1,15 @@
-import warnings
-warnings.filterwarnings('ignore')
-
+import os
+import re
 import time
 import csv
-from typing import List, Any
+import mmap
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from itertools import chain, repeat
+from operator import add
+from typing import List, Any, Dict, Iterable, Iterator, Tuple, Union
 import plyvel as pl
 
 # Local imports
@@ -13,6 +19,159 @@ from logger_config import setup_logging
 dblogger = setup_logging()
 
 log_results: bool = False
+WRITE_BUFFER_SIZE: int = 1 << 20  # Bytes accumulated in memory before each write to disk
+RECOVERY_BATCH_SIZE: int = 50000  # Number of keys per write batch while recovering from a file
+WRITE_QUEUE_SIZE: int = 64  # Buffered chunks allowed in flight between a scan and its writer thread
+LOG_ROWS_PER_RECORD: int = 10000  # Number of rows grouped into one log record by show_db
+
+# LevelDB open options. 'bulk_load' favours large write buffers for recovery/backup,
+# 'serving' favours a large block cache for lookups and dumps.
+DB_PROFILES: Dict[str, Dict[str, Any]] = {
+    'default': {
+        'write_buffer_size': 128 << 20,
+        'max_open_files': 1024,
+        'block_size': 64 << 10,
+        'lru_cache_size': 512 << 20,
+        'bloom_filter_bits': 10,
+        'compression': 'snappy',
+    },
+    'bulk_load': {
+        'write_buffer_size': 256 << 20,
+        'max_open_files': 1024,
+        'block_size': 64 << 10,
+        'lru_cache_size': 64 << 20,
+        'bloom_filter_bits': 10,
+        'compression': 'snappy',
+        'paranoid_checks': False,
+    },
+    'serving': {
+        'write_buffer_size': 32 << 20,
+        'max_open_files': 1024,
+        'block_size': 16 << 10,
+        'lru_cache_size': 1 << 30,
+        'bloom_filter_bits': 10,
+        'compression': 'snappy',
+    },
+}
+
+# UTF-8 continuation bytes; deleting them from an encoded key leaves one byte per code point
+_UTF8_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+# Bounds on the UTF-8 lead byte of Urdu characters. Keys sorting outside [start, stop)
+# begin with a non-Urdu character and need no per-character check.
+_URDU_KEY_START: bytes = min(char.encode('utf-8')[:1] for char in urdu_chars)
+_URDU_KEY_STOP: bytes = bytes([max(char.encode('utf-8')[0] for char in urdu_chars) + 1])
+
+# Matches words made up only of Urdu characters
+_URDU_WORD_RE = re.compile('[' + ''.join(map(re.escape, sorted(urdu_chars))) + ']*')
+
+
+def _utf8_charset_pattern(chars: Any) -> bytes:
+    """
+    Build a bytes regex matching any single character of a set in its UTF-8 encoding.
+
+    Encodings are grouped by their leading bytes so each group becomes one byte class,
+    e.g. all characters sharing the lead byte 0xD8 become one class instead of an alternation.
+
+    Args:
+        chars: Iterable of single-character strings.
+
+    Returns:
+        bytes: The regex source for one character of the set.
+    """
+    groups: Dict[bytes, List[int]] = {}
+    for char in chars:
+        encoded = char.encode('utf-8')
+        groups.setdefault(encoded[:-1], []).append(encoded[-1])
+
+    alternatives = [
+        re.escape(prefix) + b'[' + b''.join(re.escape(bytes([last])) for last in sorted(lasts)) + b']'
+        for prefix, lasts in sorted(groups.items())
+    ]
+    return b'(?:' + b'|'.join(alternatives) + b')'
+
+# Same check as _URDU_WORD_RE, run directly on UTF-8 encoded keys without decoding them
+_URDU_KEY_RE = re.compile(_utf8_charset_pattern(urdu_chars) + b'*')
+
+def _mmap_lines(file_name: str) -> Iterator[bytes]:
+    """
+    Lazily yield the raw lines of a file through a read-only memory map.
+
+    Args:
+        file_name (str): Path to the file to read.
+
+    Yields:
+        bytes: Each line of the file, including its trailing newline.
+    """
+    with open(file_name, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+
+        mfile = mmap.mmap(file.fileno(), 0, prot=mmap.PROT_READ)
+        try:
+            if hasattr(mfile, 'madvise'):
+                mfile.madvise(mmap.MADV_SEQUENTIAL)
+            yield from iter(mfile.readline, b"")
+        finally:
+            mfile.close()
+
+def _buffered_chunks(lines: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Group lines into chunks of roughly WRITE_BUFFER_SIZE bytes.
+
+    Args:
+        lines (Iterable[bytes]): Encoded lines to group.
+
+    Yields:
+        bytes: Concatenated lines, at least WRITE_BUFFER_SIZE bytes long except for the last chunk.
+    """
+    buf = bytearray()
+    for line in lines:
+        buf += line
+        if len(buf) >= WRITE_BUFFER_SIZE:
+            yield bytes(buf)
+            buf.clear()
+    if buf:
+        yield bytes(buf)
+
+def _write_in_background(file_name: str, chunks: Iterable[bytes]) -> None:
+    """
+    Append chunks to a file from a separate thread while the caller keeps producing them.
+
+    plyvel and file writes both release the GIL, so scanning the database and writing the file overlap.
+
+    Args:
+        file_name (str): Path to the file the chunks are appended to.
+        chunks (Iterable[bytes]): Chunks to write, produced in the calling thread.
+
+    Raises:
+        Exception: Any error raised by the writer thread, re-raised in the calling thread.
+    """
+    pending: queue.Queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+    errors: List[Exception] = []
+
+    def writer() -> None:
+        try:
+            with open(file_name, 'ab') as file:
+                while (chunk := pending.get()) is not None:
+                    file.write(chunk)
+        except Exception as e:
+            errors.append(e)
+            # Keep draining so the producer never blocks on a full queue
+            while pending.get() is not None:
+                pass
+
+    writer_thread = threading.Thread(target=writer, daemon=True)
+    writer_thread.start()
+    try:
+        for chunk in chunks:
+            pending.put(chunk)
+    finally:
+        pending.put(None)
+        writer_thread.join()
+
+    if errors:
+        raise errors[0]
 
 class LevelDB:
     """
@@ -20,41 +179,103 @@ class LevelDB:
     such as adding data, checking contents, dumping data, and recovering data from files.
     """
 
-    def __init__(self, path: str):
+    def __init__(self, path: str, profile: str = 'default', **options: Any):
         """
         Initialize the LevelDB instance and open the database.
 
         Args:
             path (str): Path to the LevelDB database.
+            profile (str): Name of the option set in DB_PROFILES to open the database with.
+            **options: Extra plyvel.DB options, overriding those of the profile.
         """
+        if profile not in DB_PROFILES:
+            raise ValueError(f"Unknown profile '{profile}', choose from {list(DB_PROFILES)}")
+
         self._path: str = path
-        self.db = pl.DB(self._path, create_if_missing=True)
+        db_options: Dict[str, Any] = {**DB_PROFILES[profile], **options}
+        self.db = pl.DB(self._path, create_if_missing=True, **db_options)
         self.db_closed: bool = False
         dblogger.info(f"Created database at {path}")
 
+    @contextmanager
+    def _scan(self, **kwargs: Any) -> Iterator[Any]:
+        """
+        Iterate over a consistent snapshot of the database.
+
+        Args:
+            **kwargs: Options forwarded to the snapshot's iterator (include_value, fill_cache, ...).
+
+        Yields:
+            The snapshot iterator, closed along with the snapshot on exit.
+        """
+        snapshot = self.db.snapshot()
+        iterator = snapshot.iterator(**kwargs)
+        try:
+            yield iterator
+        finally:
+            iterator.close()
+            snapshot.close()
+
     def add_batch(self, words: List[tuple]) -> None:
         """
         Add a batch of key-value pairs to the database.
 
         Args:
-            words (List[tuple]): A list of tuples where each tuple contains a key and a value.
+            words (List[tuple]): A list of tuples where each tuple contains a key and a value, either
+                all as str or all as already encoded bytes.
         """
+        if not words:
+            return
+
         with self.db.write_batch() as batch:
-            for key, value in words:
-                batch.put(key.encode('utf-8'), value.encode('utf-8'))
+            if isinstance(words[0][0], (bytes, bytearray)):
+                for key, value in words:
+                    batch.put(key, value)
+            else:
+                for key, value in words:
+                    batch.put(key.encode('utf-8'), value.encode('utf-8'))
+
+    def bulk_load(self, entries: Iterable[Tuple[bytes, bytes]]) -> int:
+        """
+        Load key-value pairs from a trusted source as fast as possible.
 
-    def check(self, key: str) -> bool:
+        Intermediate batches are written without syncing to disk; only the final write is synced.
+        If the process dies midway, the load can simply be re-run.
+
+        Args:
+            entries (Iterable[Tuple[bytes, bytes]]): Encoded key-value pairs to load.
+
+        Returns:
+            int: The number of pairs loaded.
+        """
+        num_entries = 0
+        with self.db.write_batch(transaction=False) as batch:
+            for key, value in entries:
+                batch.put(key, value)
+                num_entries += 1
+                if num_entries % RECOVERY_BATCH_SIZE == 0:
+                    batch.write()
+                    batch.clear()
+
+        # An empty synced batch flushes the write-ahead log for everything written above
+        self.db.write_batch(sync=True).write()
+        return num_entries
+
+    def check(self, key: Union[str, bytes]) -> bool:
         """
         Check if a key exists in the database.
 
         Args:
-            key (str): The key to check in the database.
+            key (Union[str, bytes]): The key to check in the database, as str or encoded bytes.
 
         Returns:
             bool: True if the key does not exist, False otherwise.
         """
+        if isinstance(key, str):
+            key = key.encode('utf-8')
+
         try:
-            return self.db.get(key.encode('utf-8')) is None
+            return self.db.get(key) is None
         except pl.Error as e:
             dblogger.error(f"Error checking key '{key}': {e}")
             raise e
@@ -68,9 +289,10 @@ class LevelDB:
         """
         db_size, db_length = 0, 0
         try:
-            for key, value in self.db:
-                db_length += 1
-                db_size += len(key) + len(value)
+            with self._scan(fill_cache=False) as iterator:
+                for key, value in iterator:
+                    db_length += 1
+                    db_size += len(key) + len(value)
         except pl.Error as e:
             dblogger.error(f"Error iterating over database: {e}")
         return db_size, db_length
@@ -79,10 +301,20 @@ class LevelDB:
         """
         Log the contents of the database.
         """
-        dblogger.info(f"Contents of db at: {self._path}")
+        if not dblogger.isEnabledFor(logging.INFO):
+            return
+
+        dblogger.info("Contents of db at: %s", self._path)
         try:
-            for key, value in self.db.iterator():
-                dblogger.info(f"{key.decode('utf-8')} - {value.decode('utf-8')}")
+            with self._scan(fill_cache=False) as iterator:
+                rows: List[str] = []
+                for key, value in iterator:
+                    rows.append(key.decode('utf-8') + ' - ' + value.decode('utf-8'))
+                    if len(rows) >= LOG_ROWS_PER_RECORD:
+                        dblogger.info("\n".join(rows))
+                        rows = []
+                if rows:
+                    dblogger.info("\n".join(rows))
         except pl.Error as e:
             dblogger.error(f"Error showing database: {e}")
 
@@ -109,19 +341,35 @@ class LevelDB:
             raise e
         dblogger.warning("Destroyed db!")
 
-    def dump_to_csv(self, csv_file: str) -> None:
+    def dump_to_csv(self, csv_file: str, csv_safe: bool = True) -> None:
         """
         Dump the database contents to a CSV file.
 
         Args:
             csv_file (str): Path to the CSV file where the database contents will be written.
+            csv_safe (bool): If True, keys are written as raw bytes without CSV quoting. Set to False
+                if the keys can contain commas or quotes.
         """
         try:
-            with open(csv_file, 'w', newline='', encoding='utf-8') as csvfile:
-                csv_writer = csv.writer(csvfile)
-                csv_writer.writerow(['Words'])
-                for key, value in self.db.iterator():
-                    csv_writer.writerow([key.decode('utf-8')])
+            if csv_safe:
+                with open(csv_file, 'wb') as csvfile:
+                    csvfile.write(b'Words\n')
+                    buf = bytearray()
+                    with self._scan(include_value=False, fill_cache=False) as iterator:
+                        for key in iterator:
+                            buf += key + b'\n'
+                            if len(buf) >= WRITE_BUFFER_SIZE:
+                                csvfile.write(buf)
+                                buf.clear()
+                    if buf:
+                        csvfile.write(buf)
+            else:
+                with open(csv_file, 'w', newline='', encoding='utf-8') as csvfile:
+                    csv_writer = csv.writer(csvfile)
+                    csv_writer.writerow(['Words'])
+                    with self._scan(include_value=False, fill_cache=False) as iterator:
+                        for key in iterator:
+                            csv_writer.writerow([key.decode('utf-8')])
             dblogger.info(f"Successfully dumped database contents to CSV file: {csv_file}")
         except Exception as e:
             dblogger.error(f"Error dumping database contents to CSV file: {e}")
@@ -136,18 +384,35 @@ class LevelDB:
             only_tokens (bool): If True, only keys (tokens) are written. If False, both keys and values are written.
         """
         try:
-            with open(txt_file, 'a', encoding='utf-8') as txtfile:
-                txtfile.write('Words\n')
-                for key, value in self.db.iterator():
-                    if only_tokens:
-                        txtfile.write(key.decode('utf-8') + '\n')
-                    else:
-                        txtfile.write(key.decode('utf-8') + ',' + value.decode('utf-8') + '\n')
+            dump = self._dump_keys_only if only_tokens else self._dump_kv
+            dump(txt_file)
             dblogger.info(f"Successfully dumped database contents to file: {txt_file}")
         except Exception as e:
             dblogger.error(f"Error dumping database contents to TXT file: {e}")
             raise e
 
+    def _dump_keys_only(self, txt_file: str) -> None:
+        """
+        Append a header and one key per line to a TXT file.
+
+        Args:
+            txt_file (str): Path to the TXT file where the keys will be written.
+        """
+        with self._scan(include_value=False, fill_cache=False) as iterator:
+            lines = map(add, iterator, repeat(b'\n'))
+            _write_in_background(txt_file, _buffered_chunks(chain([b'Words\n'], lines)))
+
+    def _dump_kv(self, txt_file: str) -> None:
+        """
+        Append a header and one comma separated key-value pair per line to a TXT file.
+
+        Args:
+            txt_file (str): Path to the TXT file where the pairs will be written.
+        """
+        with self._scan(fill_cache=False) as iterator:
+            lines = map(add, map(b','.join, iterator), repeat(b'\n'))
+            _write_in_background(txt_file, _buffered_chunks(chain([b'Words\n'], lines)))
+
     def recover_db_from_txt(self, txt_file: str) -> None:
         """
         Recover the database from a TXT file.
@@ -156,12 +421,9 @@ class LevelDB:
             txt_file (str): Path to the TXT file containing the data to recover.
         """
         try:
-            with open(txt_file, 'r', encoding='utf-8') as txtfile:
-                file_reader = txtfile.readlines()
-                for word in file_reader:
-                    word = word.strip()
-                    self.db.put(word.encode('utf-8'), word.encode('utf-8'))
-            dblogger.info(f"Successfully recovered database from TXT file: {txt_file}")
+            words = (line.strip() for line in _mmap_lines(txt_file))
+            num_words = self.bulk_load((word, word) for word in words if word)
+            dblogger.info(f"Successfully recovered {num_words} words from TXT file: {txt_file}")
         except Exception as e:
             dblogger.error(f"Error recovering database from TXT file: {e}")
             raise e
@@ -174,31 +436,27 @@ class LevelDB:
             csv_file (str): Path to the CSV file containing the data to recover.
         """
         try:
-            with open(csv_file, 'r', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                for row in reader:
-                    if row:
-                        word = row[0].strip()
-                        self.db.put(word.encode('utf-8'), word.encode('utf-8'))
-            dblogger.info(f"Successfully recovered database from CSV file: {csv_file}")
+            lines = (line.decode('utf-8') for line in _mmap_lines(csv_file))
+            words = (row[0].strip().encode('utf-8') for row in csv.reader(lines) if row)
+            num_words = self.bulk_load((word, word) for word in words)
+            dblogger.info(f"Successfully recovered {num_words} words from CSV file: {csv_file}")
         except Exception as e:
             dblogger.error(f"Error recovering database from CSV file: {e}")
             raise e
 
-    def unicode_helper(self, word: str) -> bool:
+    def unicode_helper(self, word: Union[str, bytes]) -> bool:
         """
         Check if a word contains only Urdu characters.
 
         Args:
-            word (str): The word to check.
+            word (Union[str, bytes]): The word to check, as str or UTF-8 encoded bytes.
 
         Returns:
             bool: True if the word contains only Urdu characters, False otherwise.
         """
-        for char in word:
-            if char not in urdu_chars:
-                return False
-        return True
+        if isinstance(word, bytes):
+            return _URDU_KEY_RE.fullmatch(word) is not None
+        return _URDU_WORD_RE.fullmatch(word) is not None
 
     def check_for_ur_unicode(self, if_remove: bool = True) -> int:
         """
@@ -211,29 +469,41 @@ class LevelDB:
             int: The number of non-Urdu words found.
         """
         dblogger.info('Checking for non-Urdu words')
-        non_urdu_words: List[str] = []
+        num_non_urdu: int = 0
 
         try:
-            for key, value in self.db.iterator():
-                decoded_key: str = key.decode('utf-8')
-
-                if not self.unicode_helper(decoded_key):
-                    non_urdu_words.append(decoded_key)
-
-            if non_urdu_words:
-                dblogger.info(f'{len(non_urdu_words)} non-Urdu words found!')
-                dblogger.info(f'{len(set(non_urdu_words))} number of unique words found')
-
-                if if_remove:
-                    for word in set(non_urdu_words):
-                        self.db.delete(word.encode('utf-8'))
+            # (iterator bounds, whether keys in that range need a per-character check)
+            scan_ranges = (
+                ({'stop': _URDU_KEY_START}, False),
+                ({'start': _URDU_KEY_START, 'stop': _URDU_KEY_STOP}, True),
+                ({'start': _URDU_KEY_STOP}, False),
+            )
+
+            # One snapshot for all three ranges, so they see the same state of the database.
+            # LevelDB keys are unique, so every offending key is deleted exactly once
+            with self.db.snapshot() as snapshot, self.db.write_batch(transaction=False) as batch:
+                for bounds, needs_check in scan_ranges:
+                    with snapshot.iterator(include_value=False, fill_cache=False, **bounds) as iterator:
+                        for key in iterator:
+                            if not key or (needs_check and self.unicode_helper(key)):
+                                continue
+
+                            num_non_urdu += 1
+                            if if_remove:
+                                batch.delete(key)
+                                if num_non_urdu % RECOVERY_BATCH_SIZE == 0:
+                                    batch.write()
+                                    batch.clear()
+
+            if num_non_urdu:
+                dblogger.info(f'{num_non_urdu} non-Urdu words found!')
             else:
                 dblogger.info("No non-Urdu words found in the database.")
         
         except pl.Error as e:
             dblogger.error(f"Error iterating over database: {e}")
 
-        return len(non_urdu_words)
+        return num_non_urdu
     
     def get_word_lengths(self, csvname: str) -> None:
         """
@@ -245,19 +515,35 @@ class LevelDB:
         dblogger.info('Checking for word lengths')
 
         try:
-            with open(csvname, 'a', encoding='utf-8') as csvfile:
-                csv_writer = csv.writer(csvfile)
-                csv_writer.writerow(['Word', 'lengths'])
-
-                for key, value in self.db.iterator():
-                    dkey: str = key.decode('utf-8')
-                    words = dkey.split(' ')
-
-                    if len(words) > 1:
-                        dblogger.info(f'Word length is greater than one for this word: {dkey}')
-                    else:
-                        csv_writer.writerow([dkey, len(dkey)])
-
+            with open(csvname, 'ab') as csvfile:
+                buf = bytearray(b'Word,lengths\n')
+
+                num_multi_word = 0
+                log_multi_word = dblogger.isEnabledFor(logging.DEBUG)
+
+                with self._scan(include_value=False, fill_cache=False) as iterator:
+                    for key in iterator:
+                        if b' ' in key:
+                            num_multi_word += 1
+                            if log_multi_word:
+                                dblogger.debug("Word length is greater than one for this word: %s", key.decode('utf-8'))
+                            continue
+
+                        if key.isascii():
+                            length = len(key)
+                        else:
+                            length = len(key.translate(None, _UTF8_CONTINUATION_BYTES))
+
+                        buf += key + b',' + str(length).encode() + b'\n'
+                        if len(buf) >= WRITE_BUFFER_SIZE:
+                            csvfile.write(buf)
+                            buf.clear()
+
+                if buf:
+                    csvfile.write(buf)
+
+            if num_multi_word:
+                dblogger.info('Skipped %d keys with more than one word', num_multi_word)
             dblogger.info('CSV file created!')
         except Exception as e:
             dblogger.error(f"Error processing database for word lengths: {e}")
@@ -270,8 +556,8 @@ class LevelDB:
         Args:
             bdb_path (str): Path to the backup LevelDB database.
         """
-        _backupdb = LevelDB(bdb_path)
-        for key, value in self.db.iterator():
-            _backupdb.add_batch([(key.decode('utf-8'), value.decode('utf-8'))])
+        _backupdb = LevelDB(bdb_path, profile='bulk_load')
+        with self._scan(fill_cache=False) as iterator:
+            _backupdb.bulk_load(iterator)
         
         dblogger.info(f"Backup created for {self._path}. Check path: {bdb_path}")
@@ -1,14 +1,14 @@
 import re
 import stanza
 import warnings
-import unicodedata
 from spacy.lang.hi import Hindi
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from indicnlp.normalize.indic_normalize import IndicNormalizerFactory
 from indicnlp.tokenize import indic_tokenize
 import stanza.pipeline
 
 # local imports
+from char_tables import build_script_mask
 
 class HindiTextCleaner:
     """
@@ -17,6 +17,10 @@ class HindiTextCleaner:
     Attributes:
         text (str): The text to be cleaned and normalized.
     """
+
+    _HI_RE = re.compile(r'[^\u0900-\u097F]')  # Anything outside the Devanagari block
+    _PUNCT_RE = re.compile(r'[।॥.,-_*%?!#@=+|(){}[\]\'\"“”‘’]')
+    _SPACES_RE = re.compile(r'\s+')
     
     def __init__(self, text: str) -> None:
         """
@@ -26,21 +30,10 @@ class HindiTextCleaner:
             text (str): The text to be cleaned.
         """
         self.text = text
-        self._emoji_patterns = re.compile("["
-            u"\U0001F600-\U0001F64F"  # Emoticons
-            u"\U0001F300-\U0001F5FF"  # Symbols and Pictographs
-            u"\U0001F680-\U0001F6FF"  # Transport and Map Symbols
-            u"\U0001F1E0-\U0001F1FF"  # Regional Indicator Symbols
-            u"\U00002702-\U000027B0"  # Dingbats
-            u"\U000024C2-\U0001F251"  # Enclosed Characters
-            "]+",
-            flags=re.UNICODE,
-        )
         self._numbers = {
             'hindi': ['०', '१', '२', '३', '४', '५', '६', '७', '८', '९'],
             'english': ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9']      
         }
-        self._hi = re.compile(r'[^\u0900-\u097F]', flags=re.UNICODE)
         self.normalizer = IndicNormalizerFactory().get_normalizer(language="hi", remove_nuktas=False)
 
     def normalize(self):
@@ -53,8 +46,8 @@ class HindiTextCleaner:
         """
         Remove punctuation and non-Hindi characters from the text.
         """
-        self.text = re.sub(self._hi, ' ', self.text)
-        self.text = re.sub(r'[।॥.,-_*%?!#@=+|(){}[\]\'\"“”‘’]', ' ', self.text)
+        self.text = self._HI_RE.sub(' ', self.text)
+        self.text = self._PUNCT_RE.sub(' ', self.text)
 
     def remove_numbers(self):
         """
@@ -67,7 +60,7 @@ class HindiTextCleaner:
         """
         Remove extra spaces from the text.
         """
-        self.text = re.sub(r'\s+', ' ', self.text).strip()
+        self.text = self._SPACES_RE.sub(' ', self.text).strip()
 
     def clean(self):
         """
@@ -84,6 +77,14 @@ class HindiTextCleaner:
         return self.text
 
 
+_HI_UNICODE_RANGES: List[Tuple[int, int]] = [
+    (0x0900, 0x097F)  # Unicode range for Hindi script
+]
+
+# 1 for every Hindi letter (category 'Lo' inside the range above), indexed by code point
+_HI_MASK = build_script_mask(_HI_UNICODE_RANGES)
+
+
 class HindiTokenizer:
     """
     A class to tokenize Hindi text using different tokenization methods.
@@ -116,9 +117,7 @@ class HindiTokenizer:
         elif self.tokenizer == 'indicnlp':
             self.indic_tokenizer = None  # Placeholder if needed in future
         
-        self._hi_unicode_range = [
-            (0x0900, 0x097F)  # Unicode range for Hindi script
-        ]
+        self._hi_unicode_range = _HI_UNICODE_RANGES
 
     def helper(self, word: str) -> bool:
         """
@@ -130,20 +129,18 @@ class HindiTokenizer:
         Returns:
             bool: True if the word contains Hindi characters, False otherwise.
         """
-        for char in word:
-            if unicodedata.category(char) == 'Lo':
-                char_code = ord(char)
-                if any(start <= char_code <= end for start, end in self._hi_unicode_range):
-                    return True
-        
-        return False
+        return any(map(_HI_MASK.__getitem__, map(ord, word)))
 
     def remove_non_hi_tokens(self):
         """
         Remove tokens that do not contain Hindi characters.
+
+        Repeated tokens are only checked once: the distinct tokens are filtered and the result
+        is used as a lookup for the full list.
         """
         if self.token_list is not None:
-            self.token_list = [word for word in self.token_list if self.helper(word)]
+            keep = set(filter(self.helper, set(self.token_list)))
+            self.token_list = [word for word in self.token_list if word in keep]
 
     def _tokenize_with_spacy(self, text: str, is_unique: bool = True):
         """
@@ -63,6 +63,7 @@ def main_fn(ifile_name: str, db: LevelDB, ofile_name: str) -> None:
                     temp = 0
 
                 for token in tokens:
+                    token = token.encode('utf-8')
                     if db.check(token):
                         unique_words.append((token, token))
 
@@ -3,13 +3,17 @@ import nltk
 import spacy
 import stanza
 import warnings
-import unicodedata
-from typing import Any, List
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 from indicnlp.tokenize import indic_tokenize
 from spacy.lang.ur import Urdu
 
 # Local imports
 from ur_normalize import normalize_urdu_text
+from char_tables import LazyTranslationTable, build_script_mask, mask_char_class
+
+# Serve tokenizer='stanza' with the spaCy pipeline instead: tokenization only, no torch on the path
+STANZA_FAST_TOKENIZE: bool = False
 
 warnings.filterwarnings('ignore')
 
@@ -21,6 +25,13 @@ class UrduTextCleaner:
         text (str): The text to be cleaned and normalized.
         language (str): Language code (default is 'ur').
     """
+
+    __slots__ = ('text', 'language', '_translate_table')
+
+    # U+3000 (ideographic space) is whitespace but falls inside the old 'Enclosed Characters' emoji range
+    _NON_URDU_RE = re.compile(r'[^\u0600-\u06FF\s]|\u3000')
+    _NUM_RE = re.compile(r'[۰۱۲۳۴۵۶۷۸۹0-9]')  # Urdu (U+06F0-U+06F9) and English digits
+    _PUNCT_RE = re.compile(r'[؟,۔.,-_*%?!#@=+|(){}[\]\'\"“”‘’]')
     
     def __init__(self, text: str, language: str = 'ur'):
         """
@@ -33,21 +44,7 @@ class UrduTextCleaner:
         self.text: str = text
         self.language: str = language
 
-        self._numbers = {
-            'urdu': ['۶', '۴', '۵', '۸', '۲', '۰', '۷', '۹', '۳', '۱'],
-            'english': ['1', '2', '3', '4', '5', '6', '7', '8', '9', '0']
-        }
-        self._emoji_patterns = re.compile(
-            "["
-            u"\U0001F600-\U0001F64F"  # Emoticons
-            u"\U0001F300-\U0001F5FF"  # Symbols and Pictographs
-            u"\U0001F680-\U0001F6FF"  # Transport and Map Symbols
-            u"\U0001F1E0-\U0001F1FF"  # Regional Indicator Symbols
-            u"\U00002702-\U000027B0"  # Dingbats
-            u"\U000024C2-\U0001F251"  # Enclosed Characters
-            "]+",
-            flags=re.UNICODE,
-        )   
+        self._translate_table = _URDU_CLEAN_TABLE
 
     def normalize(self) -> None:
         """
@@ -58,51 +55,124 @@ class UrduTextCleaner:
     def remove_special_characters(self) -> None:
         """
         Remove non-Uurdu characters and emojis from the text.
+
+        Emojis lie outside the Urdu block, so the non-Urdu pattern already removes them; the
+        ideographic space, the one whitespace character of the emoji ranges, is matched explicitly.
         """
-        self.text = re.sub(r'[^\u0600-\u06FF\s]', '', self.text)  # Remove non-Urdu characters
-        self.text = self._emoji_patterns.sub(r'', self.text)  # Remove emojis
+        self.text = self._NON_URDU_RE.sub('', self.text)  # Remove non-Urdu characters (emojis included)
 
     def rem_word_punct_diac(self) -> None:
         """
         Remove punctuation and diacritical marks from the text.
         """
-        self.text = re.sub(r'[؟,۔.,-_*%?!#@=+|(){}[\]\'\"“”‘’]', ' ', self.text)
+        self.text = self._PUNCT_RE.sub(' ', self.text)
 
     def remove_nums(self) -> None:
         """
         Remove both Urdu and English numerals from the text.
         """
-        for num in self._numbers['urdu'] + self._numbers['english']:
-            self.text = self.text.replace(num, '')
+        self.text = self._NUM_RE.sub('', self.text)
 
     def clean_data(self) -> str:
         """
         Perform the complete text cleaning process including removing special characters,
         punctuation, numbers, and normalizing the text.
+
+        The first three steps only ever replace single characters, so they are applied together
+        in one str.translate pass over the text. Pure ASCII text has no Urdu in it and is
+        returned as an empty string without a pass.
         
         Returns:
             str: The cleaned and normalized text.
         """
-        self.remove_special_characters()
-        self.rem_word_punct_diac() 
-        self.remove_nums()
+        if self.text.isascii():
+            # No ASCII character is Urdu, so nothing but whitespace would survive the cleaning
+            self.text = ''
+            return self.text
+
+        self.text = self.text.translate(self._translate_table)
         self.normalize()
 
         return self.text
 
 
+def _clean_urdu_char(codepoint: int) -> str:
+    """
+    Run a single character through the per-step cleaning methods of UrduTextCleaner.
+
+    Args:
+        codepoint (int): The code point to clean.
+
+    Returns:
+        str: What the character becomes in the cleaned text ('' if it is removed).
+    """
+    cleaner = UrduTextCleaner(chr(codepoint))
+    cleaner.remove_special_characters()
+    cleaner.rem_word_punct_diac()
+    cleaner.remove_nums()
+    return cleaner.text
+
+# Shared by every UrduTextCleaner so the mappings worked out for one text are reused by the next
+_URDU_CLEAN_TABLE = LazyTranslationTable(_clean_urdu_char)
+
+
+_URDU_UNICODE_RANGES = [
+    (0x0600, 0x06FF),  # Arabic script
+    (0x0750, 0x077F),  # Arabic Supplement
+    (0xFB50, 0xFDFF),  # Arabic Presentation Forms-A
+    (0xFE70, 0xFEFF)   # Arabic Presentation Forms-B
+]
+
+# 1 for every Urdu letter (category 'Lo' inside the ranges above), indexed by code point
+_URDU_MASK = build_script_mask(_URDU_UNICODE_RANGES)
+_URDU_TOKEN_RE = re.compile(mask_char_class(_URDU_MASK))  # Finds the first such character in a token
+
+@lru_cache(maxsize=8)
+def _get_pipeline(kind: str, language: str) -> Any:
+    """
+    Build a tokenization pipeline once per process and share it between tokenizers.
+
+    Loading Stanza or spaCy pipelines is expensive, so every UrduTokenizer with the same
+    settings reuses the same object.
+
+    Args:
+        kind (str): The tokenization method ('nltk', 'spacy', 'stanza').
+        language (str): The language code.
+
+    Returns:
+        Any: The tokenizer callable or pipeline.
+    """
+    if kind == 'nltk':
+        return nltk.word_tokenize
+
+    elif kind == 'spacy':
+        # Only the tokenizer is needed, so skip wrapping it in an empty Language pipeline
+        return Urdu().tokenizer if language == 'ur' else spacy.blank(language).tokenizer
+
+    elif kind == 'stanza':
+        # Fetch the model here, once per cached pipeline, so the Pipeline itself skips its resources check
+        stanza.download(language, processors='tokenize', verbose=False)
+        return stanza.Pipeline(processors='tokenize', lang=language, tokenize_batch_size=64, download_method=None)
+
+    raise ValueError(f"No pipeline available for tokenizer '{kind}'")
+
+
 class UrduTokenizer:
     """
     A class to tokenize Urdu text using various tokenization methods.
     
     Attributes:
-        word_list (List[str]): The list of tokens extracted from the text.
         tokenizer (str): The tokenization method to use ('nltk', 'spacy', 'stanza', 'indicnlp').
         nltk_tokenizer: NLTK tokenizer function.
-        spacy_tokenizer: SpaCy tokenizer for Urdu.
+        spacy_tokenizer: SpaCy tokenizer for Urdu (a spacy Tokenizer, not a full pipeline).
         stanza_tokenizer: Stanza tokenizer for Urdu.
         _urdu_unicode_range (List[Tuple[int, int]]): Unicode ranges for Urdu characters.
     """
+
+    __slots__ = (
+        'tokenizer', 'nltk_tokenizer', 'spacy_tokenizer', 'stanza_tokenizer', 'indic_tokenizer',
+        '_urdu_unicode_range',
+    )
     
     def __init__(self, language: str = 'ur', tokenizer: str = 'nltk'):
         """
@@ -112,27 +182,24 @@ class UrduTokenizer:
             language (str): The language code (default is 'ur').
             tokenizer (str): The tokenization method to use ('nltk', 'spacy', 'stanza', 'indicnlp').
         """
-        self.word_list: List[str] = []
+        # Stanza's own spaCy tokenizer is English-only, so the fast path swaps in the spaCy backend
+        if tokenizer == 'stanza' and STANZA_FAST_TOKENIZE:
+            tokenizer = 'spacy'
         self.tokenizer = tokenizer
 
         if self.tokenizer == 'nltk':
-            self.nltk_tokenizer = nltk.word_tokenize
+            self.nltk_tokenizer = _get_pipeline('nltk', language)
         
         elif self.tokenizer == 'spacy':
-            self.spacy_tokenizer = spacy.blank('ur')
+            self.spacy_tokenizer = _get_pipeline('spacy', language)
 
         elif self.tokenizer == 'stanza':
-            self.stanza_tokenizer = stanza.Pipeline(processors='tokenize', lang='ur')
+            self.stanza_tokenizer = _get_pipeline('stanza', language)
         
         elif self.tokenizer == 'indicnlp':
             self.indic_tokenizer = None
 
-        self._urdu_unicode_range = [
-            (0x0600, 0x06FF),  # Arabic script
-            (0x0750, 0x077F),  # Arabic Supplement
-            (0xFB50, 0xFDFF),  # Arabic Presentation Forms-A
-            (0xFE70, 0xFEFF)   # Arabic Presentation Forms-B
-        ]
+        self._urdu_unicode_range = _URDU_UNICODE_RANGES
 
     def _tokenize_with_nltk(self, text: str, is_unique: bool = True):
         """
@@ -146,14 +213,8 @@ class UrduTokenizer:
             Tuple[int, int, List[str]]: Number of tokens, number of unique tokens, and list of tokens.
         """
         tokens = self.nltk_tokenizer(text)
-        num_tokens = len(tokens)
-        
-        if is_unique:
-            words = list(set(tokens))
-        else:
-            words = tokens
-        
-        return num_tokens, len(words), words
+
+        return self._finalize(tokens, is_unique)
     
     def _tokenize_with_stanza(self, text: str, is_unique: bool = True):
         """
@@ -168,14 +229,8 @@ class UrduTokenizer:
         """
         doc = self.stanza_tokenizer(text)
         tokens = [word.text for sentence in doc.sentences for word in sentence.words]
-        len_tokens = len(tokens)
 
-        if is_unique:
-            words = list(set(tokens))
-        else:
-            words = tokens
-        
-        return len(tokens), len(words), words
+        return self._finalize(tokens, is_unique)
 
     def _tokenize_with_spacy(self, text: str, is_unique: bool = True):
         """
@@ -190,14 +245,8 @@ class UrduTokenizer:
         """
         doc = self.spacy_tokenizer(text)
         tokens = [token.text for token in doc]
-        len_tokens = len(tokens)
-        
-        if is_unique:
-            words = list(set(tokens))
-        else:
-            words = tokens
-        
-        return len(tokens), len(words), words
+
+        return self._finalize(tokens, is_unique)
 
     def _tokenize_with_indicnlp(self, text: str, is_unique: bool = True):
         """
@@ -211,14 +260,24 @@ class UrduTokenizer:
             Tuple[int, int, List[str]]: Number of tokens, number of unique tokens, and list of tokens.
         """
         tokens = indic_tokenize.trivial_tokenize(text, lang='urd')
-        len_tokens = len(tokens)
 
-        if is_unique:
-            utokens = list(set(tokens))
-        else:
-            utokens = tokens
+        return self._finalize(tokens, is_unique)
+
+    def _finalize(self, tokens: List[str], is_unique: bool) -> Tuple[int, int, List[str]]:
+        """
+        Build the result shared by every _tokenize_with_* method.
+
+        Duplicates are dropped with dict.fromkeys, which keeps the order tokens first appear in.
+        
+        Args:
+            tokens (List[str]): The tokens produced by the tokenizer.
+            is_unique (bool): Whether to return unique tokens.
         
-        return len(tokens), len(utokens), utokens
+        Returns:
+            Tuple[int, int, List[str]]: Number of tokens, number of unique tokens, and list of tokens.
+        """
+        words = list(dict.fromkeys(tokens)) if is_unique else tokens
+        return len(tokens), len(words), words
 
     def helper(self, word: str) -> bool:
         """
@@ -230,19 +289,27 @@ class UrduTokenizer:
         Returns:
             bool: True if the word contains Urdu characters, False otherwise.
         """
-        for char in word:
-            if unicodedata.category(char) == 'Lo':
-                char_code = ord(char)
-                if any(start <= char_code <= end for start, end in self._urdu_unicode_range):
-                    return True
-        return False
+        return any(map(_URDU_MASK.__getitem__, map(ord, word)))
 
-    def remove_non_urdu_words(self) -> None:
+    def remove_non_urdu_words(self, tokens: List[str]) -> List[str]:
         """
         Remove tokens that do not contain Urdu characters.
+
+        Repeated tokens are only checked once: the distinct tokens are filtered and the result
+        is used as a lookup for the full list.
+        
+        Args:
+            tokens (List[str]): The tokens to filter.
+        
+        Returns:
+            List[str]: The tokens containing at least one Urdu character.
         """
-        if self.word_list is not None:
-            self.word_list = [word for word in self.word_list if self.helper(word)]
+        distinct = set(tokens)
+        if len(distinct) == len(tokens):
+            return list(filter(_URDU_TOKEN_RE.search, tokens))
+
+        keep = set(filter(_URDU_TOKEN_RE.search, distinct))
+        return [word for word in tokens if word in keep]
 
     def tokenize(self, text: str, is_unique: bool = True) -> List[str]:
         """
@@ -255,22 +322,100 @@ class UrduTokenizer:
         Returns:
             Tuple[int, int, List[str]]: Number of tokens, number of filtered tokens, and list of tokens.
         """
-        self.word_list = []
-
         if not is_unique:
             print('The output will not contain unique words')
 
         if self.tokenizer == 'spacy':
-            len_tokens, len_words, self.word_list = self._tokenize_with_spacy(text, is_unique)
+            len_tokens, len_words, tokens = self._tokenize_with_spacy(text, is_unique)
         
         elif self.tokenizer == 'stanza':
-            len_tokens, len_words, self.word_list = self._tokenize_with_stanza(text, is_unique)
+            len_tokens, len_words, tokens = self._tokenize_with_stanza(text, is_unique)
         
         elif self.tokenizer == 'nltk':
-            len_tokens, len_words, self.word_list = self._tokenize_with_nltk(text, is_unique)
+            len_tokens, len_words, tokens = self._tokenize_with_nltk(text, is_unique)
 
         else:
-            len_tokens, len_words, self.word_list = self._tokenize_with_indicnlp(text, is_unique)
+            len_tokens, len_words, tokens = self._tokenize_with_indicnlp(text, is_unique)
         
-        self.remove_non_urdu_words()
-        return len_tokens, len(self.word_list), self.word_list
+        tokens = self.remove_non_urdu_words(tokens)
+        return len_tokens, len(tokens), tokens
+
+    def tokenize_stream(self, texts: Iterable[str], is_unique: bool = True) -> Iterator[Tuple[int, int, List[str]]]:
+        """
+        Lazily tokenize a stream of texts and filter Urdu tokens from each of them.
+
+        Stanza and spaCy pull texts from the iterable in batches so they can process documents
+        together instead of running one mini-batch per text. Other tokenizers fall back to calling
+        tokenize per text. Only the current batch is held in memory, so corpora of any size can be
+        counted without materializing every token list.
+        
+        Args:
+            texts (Iterable[str]): The texts to tokenize.
+            is_unique (bool): Whether to return unique tokens.
+        
+        Yields:
+            Tuple[int, int, List[str]]: For each text, the number of tokens, number of filtered tokens, and list of tokens.
+        """
+        if self.tokenizer not in ('stanza', 'spacy'):
+            for text in texts:
+                yield self.tokenize(text, is_unique)
+            return
+
+        if not is_unique:
+            print('The output will not contain unique words')
+
+        if self.tokenizer == 'stanza':
+            docs = self.stanza_tokenizer.stream(stanza.Document([], text=text) for text in texts)
+            token_lists = ([word.text for sentence in doc.sentences for word in sentence.words] for doc in docs)
+
+        else:
+            docs = self.spacy_tokenizer.pipe(texts, batch_size=256)
+            token_lists = ([token.text for token in doc] for doc in docs)
+
+        for tokens in token_lists:
+            words = self.remove_non_urdu_words(self._finalize(tokens, is_unique)[2])
+            yield len(tokens), len(words), words
+
+    def bulk_tokenize(self, texts: List[str], is_unique: bool = True) -> List[Tuple[int, int, List[str]]]:
+        """
+        Tokenize many texts at once and filter Urdu tokens from each of them.
+
+        Collects the results of tokenize_stream into a list.
+        
+        Args:
+            texts (List[str]): The texts to tokenize.
+            is_unique (bool): Whether to return unique tokens.
+        
+        Returns:
+            List[Tuple[int, int, List[str]]]: For each text, the number of tokens, number of filtered tokens, and list of tokens.
+        """
+        return list(self.tokenize_stream(texts, is_unique))
+
+
+# Tokenizers built inside each worker process, keyed by (tokenizer, language)
+_TOKENIZERS: Dict[Tuple[str, str], UrduTokenizer] = {}
+
+def tokenize_worker(args: Tuple[str, str, str]) -> Tuple[int, int, List[str]]:
+    """
+    Tokenize one text inside a multiprocessing worker, e.g. Pool.imap(tokenize_worker, jobs).
+
+    tokenize keeps no per-call state, so each worker builds its UrduTokenizer once and reuses it
+    for every text it receives.
+    
+    Args:
+        args (Tuple[str, str, str]): The text, the tokenization method and the language code.
+    
+    Returns:
+        Tuple[int, int, List[str]]: Number of tokens, number of filtered tokens, and list of tokens.
+    """
+    text, tokenizer, language = args
+    key = (tokenizer, language)
+
+    if key not in _TOKENIZERS:
+        if tokenizer == 'stanza' and not STANZA_FAST_TOKENIZE:
+            # One torch thread per worker, otherwise every process starts a full OpenMP pool
+            import torch
+            torch.set_num_threads(1)
+        _TOKENIZERS[key] = UrduTokenizer(language=language, tokenizer=tokenizer)
+
+    return _TOKENIZERS[key].tokenize(text)
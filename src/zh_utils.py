@@ -3,10 +3,16 @@ import nltk
 import jieba
 import spacy
 import stanza
-import unicodedata
-from typing import List, Dict, Any
+from functools import lru_cache, partial
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
 
 ## Local imports
+from char_tables import LazyTranslationTable, build_script_mask, mask_char_class
+
+# Serve tokenizer='stanza' with the spaCy pipeline instead: tokenization only, no torch on the path
+STANZA_FAST_TOKENIZE: bool = False
+# Let jieba guess unknown words with its HMM; turning it off is about twice as fast but changes the tokens
+JIEBA_HMM: bool = True
 
 class ChineseTextCleaner:
     """
@@ -15,6 +21,14 @@ class ChineseTextCleaner:
     Attributes:
         text (str): The text to be cleaned and normalized.
     """
+
+    __slots__ = ('text', '_translate_table')
+
+    _ZH_RE = re.compile(r'[^\u4e00-\u9fff]')  # Anything outside the CJK Unified Ideographs block
+    _NUM_RE = re.compile(r'[\d一二三四五六七八九零]+')  # English and Chinese numerals
+    _SPACES_RE = re.compile(r'\s+')
+    _HTML_TAG_RE = re.compile(r'<.*?>')
+    _DATE_RE = re.compile(r'[0-9]{2}/[09]{2}/[0-9]{4}')
     
     def __init__(self, text: str):
         """
@@ -24,78 +38,135 @@ class ChineseTextCleaner:
             text (str): The text to be cleaned.
         """
         self.text = text
-        self._emoji_patterns = re.compile("["
-            u"\U0001F600-\U0001F64F"  # Emoticons
-            u"\U0001F300-\U0001F5FF"  # Symbols and Pictographs
-            u"\U0001F680-\U0001F6FF"  # Transport and Map Symbols
-            u"\U0001F1E0-\U0001F1FF"  # Regional Indicator Symbols
-            u"\U00002702-\U000027B0"  # Dingbats
-            u"\U000024C2-\U0001F251"  # Enclosed Characters
-            "]+",
-            flags=re.UNICODE,
-        )
-        self._numbers = {
-            'chinese': ['一', '二', '三', '四', '五', '六', '七', '八', '九', '零'],
-            'english': ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9']
-        }
-        self._zh = re.compile(r'[^\u4e00-\u9fff]', flags=re.UNICODE)
+        self._translate_table = _ZH_CLEAN_TABLE
 
     def remove_punctuation(self):
         """
         Remove non-Chinese characters and common punctuation marks from the text.
+
+        The punctuation marks are all outside the CJK block, so one pass of the non-Chinese
+        pattern removes them as well.
         """
-        self.text = re.sub(self._zh, ' ', self.text)
-        self.text = re.sub(r'[.,-_*%?!#@=+|(){}[\]\'\"“”‘’]', ' ', self.text)
+        self.text = self._ZH_RE.sub(' ', self.text)
     
     def remove_numbers(self):
         """
         Remove both English and Chinese numerals from the text.
         """
-        self.text = re.sub(r'\d+', ' ', self.text)
-        self.text = re.sub(r'[一二三四五六七八九零]', ' ', self.text)
+        self.text = self._NUM_RE.sub(' ', self.text)
     
     def remove_redundant_spaces(self):
         """
         Replace multiple spaces with a single space and strip leading/trailing spaces.
         """
-        self.text = re.sub(r'\s+', ' ', self.text).strip()
+        self.text = self._SPACES_RE.sub(' ', self.text).strip()
 
     def remove_dates_html_tags(self):
         """
         Remove HTML tags and date patterns from the text.
         """
-        self.text = re.sub(r'<.*?>', '', self.text)  # Remove HTML tags
-        self.text = re.sub(r'[0-9]{2}/[09]{2}/[0-9]{4}', '', self.text)  # Remove dates
+        self.text = self._HTML_TAG_RE.sub('', self.text)  # Remove HTML tags
+        self.text = self._DATE_RE.sub('', self.text)  # Remove dates
 
     def clean(self):
         """
         Perform the complete text cleaning process including removing punctuation, 
         numbers, redundant spaces, and HTML tags.
+
+        Punctuation and number removal only ever replace single characters, so they are applied
+        together in one str.translate pass before the spaces are collapsed. Pure ASCII text has
+        no Chinese in it and is returned as an empty string without a pass.
         
         Returns:
             str: The cleaned text.
         """
-        self.remove_punctuation()
-        self.remove_numbers()
-        self.remove_redundant_spaces()
+        if self.text.isascii():
+            # No ASCII character is Chinese, so the cleaned text is always empty
+            self.text = ''
+            return self.text
+
+        self.text = ' '.join(self.text.translate(self._translate_table).split())
         # Uncomment the following line if you want to remove dates and HTML tags
         # self.remove_dates_html_tags()
 
         return self.text
 
+
+def _clean_zh_char(codepoint: int) -> str:
+    """
+    Run a single character through the per-character cleaning methods of ChineseTextCleaner.
+
+    Args:
+        codepoint (int): The code point to clean.
+
+    Returns:
+        str: What the character becomes in the cleaned text (' ' if it is removed).
+    """
+    cleaner = ChineseTextCleaner(chr(codepoint))
+    cleaner.remove_punctuation()
+    cleaner.remove_numbers()
+    return cleaner.text
+
+# Shared by every ChineseTextCleaner so the mappings worked out for one text are reused by the next
+_ZH_CLEAN_TABLE = LazyTranslationTable(_clean_zh_char)
+
+_ZH_UNICODE_RANGES = [
+    (0x4E00, 0x9FFF),  # CJK Unified Ideographs
+    (0x3400, 0x4DBF),  # CJK Unified Ideographs Extension A
+    (0x2A700, 0x2B73F) # CJK Ideographs Extension B
+]
+
+# 1 for every Chinese character (category 'Lo' inside the ranges above), indexed by code point
+_ZH_MASK = build_script_mask(_ZH_UNICODE_RANGES)
+_ZH_TOKEN_RE = re.compile(mask_char_class(_ZH_MASK))  # Finds the first such character in a token
+
+@lru_cache(maxsize=4)
+def _get_pipeline(kind: str) -> Any:
+    """
+    Build a tokenization pipeline once per process and share it between tokenizers.
+
+    Loading the zh_core_web_sm model or a Stanza pipeline is expensive, so every
+    ChineseTokenizer with the same settings reuses the same object.
+
+    Args:
+        kind (str): The tokenization method ('jieba', 'spacy', 'stanza').
+
+    Returns:
+        Any: The tokenizer callable or pipeline.
+    """
+    if kind == 'jieba':
+        # A private tokenizer with its dictionary loaded up front, instead of the lazily loaded global one
+        jieba_tokenizer = jieba.Tokenizer()
+        jieba_tokenizer.initialize()
+        return partial(jieba_tokenizer.lcut, HMM=JIEBA_HMM)
+
+    elif kind == 'spacy':
+        return spacy.load(
+            'zh_core_web_sm',
+            disable=['parser', 'ner', 'tagger', 'lemmatizer', 'attribute_ruler', 'tok2vec'],
+        )
+
+    elif kind == 'stanza':
+        # Fetch the model here, once per cached pipeline, so the Pipeline itself skips its resources check
+        stanza.download('zh-hans', processors='tokenize', verbose=False)
+        return stanza.Pipeline(processors='tokenize', lang='zh-hans', tokenize_batch_size=64, download_method=None)
+
+    raise ValueError(f"No pipeline available for tokenizer '{kind}'")
+
 ## Tokenizer class - jieba left to use
 class ChineseTokenizer:
     """
     A class to tokenize Chinese text using different tokenization methods.
     
     Attributes:
-        token_list (List[str]): The list of tokens extracted from the text.
         tokenizer (str): The tokenization method to use ('jieba', 'spacy', 'stanza').
-        jieba_tokenizer: Jieba tokenizer function.
+        jieba_tokenizer: Jieba tokenizer function, returning a list of tokens.
         spacy_tokenizer: SpaCy tokenizer for Chinese.
         stanza_tokenizer: Stanza tokenizer for Chinese.
         _zh_unicode_ranges (List[Tuple[int, int]]): Unicode ranges for Chinese characters.
     """
+
+    __slots__ = ('tokenizer', 'jieba_tokenizer', 'spacy_tokenizer', 'stanza_tokenizer', '_zh_unicode_ranges')
     
     def __init__(self, language: str = 'zh', tokenizer: str = 'jieba'):
         """
@@ -105,23 +176,21 @@ class ChineseTokenizer:
             language (str): The language code (default is 'zh').
             tokenizer (str): The tokenization method to use ('jieba', 'spacy', 'stanza').
         """
-        self.token_list: List[str] = []
+        # Stanza's own spaCy tokenizer is English-only, so the fast path swaps in the spaCy backend
+        if tokenizer == 'stanza' and STANZA_FAST_TOKENIZE:
+            tokenizer = 'spacy'
         self.tokenizer = tokenizer
         
         if self.tokenizer == 'jieba':
-            self.jieba_tokenizer = jieba.cut
+            self.jieba_tokenizer = _get_pipeline('jieba')
 
         elif self.tokenizer == 'spacy':
-            self.spacy_tokenizer = spacy.load('zh_core_web_sm', disable=['parser', 'ner', 'tagger'])
+            self.spacy_tokenizer = _get_pipeline('spacy')
 
         elif self.tokenizer == 'stanza':
-            self.stanza_tokenizer = stanza.Pipeline(processors='tokenize', lang='zh-hans')
+            self.stanza_tokenizer = _get_pipeline('stanza')
 
-        self._zh_unicode_ranges = [
-            (0x4E00, 0x9FFF),  # CJK Unified Ideographs
-            (0x3400, 0x4DBF),  # CJK Unified Ideographs Extension A
-            (0x2A700, 0x2B73F) # CJK Ideographs Extension B
-        ]
+        self._zh_unicode_ranges = _ZH_UNICODE_RANGES
 
     def _tokenize_with_jieba(self, text: str, is_unique: bool = True):
         """
@@ -134,16 +203,10 @@ class ChineseTokenizer:
         Returns:
             Tuple[int, int, List[str]]: Number of tokens, number of unique tokens, and list of tokens.
         """
-        res = self.jieba_tokenizer(text)
-        res = ' '.join(res)
-        tokens = res.split()
+        # jieba emits whitespace as tokens of its own; drop them instead of joining and re-splitting
+        tokens = [token for token in self.jieba_tokenizer(text) if not token.isspace()]
 
-        if is_unique:
-            words = list(set(tokens))
-        else:
-            words = tokens
-        
-        return len(tokens), len(words), words
+        return self._finalize(tokens, is_unique)
 
     def _tokenize_with_spacy(self, text: str, is_unique: bool = True):
         """
@@ -158,14 +221,8 @@ class ChineseTokenizer:
         """
         res = self.spacy_tokenizer(text)
         tokens = [token.text for token in res]
-        len_tokens = len(tokens)
 
-        if is_unique:
-            words = list(set(tokens))
-        else:
-            words = tokens
-        
-        return len(tokens), len(words), words
+        return self._finalize(tokens, is_unique)
 
     def _tokenize_with_stanza(self, text: str, is_unique: bool = True):
         """
@@ -180,13 +237,23 @@ class ChineseTokenizer:
         """
         res = self.stanza_tokenizer(text)
         tokens = [word.text for sentence in res.sentences for word in sentence.words]
-        len_tokens = len(tokens)
 
-        if is_unique:
-            words = list(set(tokens))
-        else:
-            words = tokens
+        return self._finalize(tokens, is_unique)
+
+    def _finalize(self, tokens: List[str], is_unique: bool) -> Tuple[int, int, List[str]]:
+        """
+        Build the result shared by every _tokenize_with_* method.
+
+        Duplicates are dropped with dict.fromkeys, which keeps the order tokens first appear in.
         
+        Args:
+            tokens (List[str]): The tokens produced by the tokenizer.
+            is_unique (bool): Whether to return unique tokens.
+        
+        Returns:
+            Tuple[int, int, List[str]]: Number of tokens, number of unique tokens, and list of tokens.
+        """
+        words = list(dict.fromkeys(tokens)) if is_unique else tokens
         return len(tokens), len(words), words
 
     def helper(self, word: str) -> bool:
@@ -199,19 +266,27 @@ class ChineseTokenizer:
         Returns:
             bool: True if the word contains Chinese characters, False otherwise.
         """
-        for char in word:
-            if unicodedata.category(char) == 'Lo':
-                char_code = ord(char)
-                if any(start <= char_code <= end for start, end in self._zh_unicode_ranges):
-                    return True
-        return False
+        return any(map(_ZH_MASK.__getitem__, map(ord, word)))
 
-    def remove_non_zh_tokens(self):
+    def remove_non_zh_tokens(self, tokens: List[str]) -> List[str]:
         """
         Remove tokens that do not contain Chinese characters.
+
+        Repeated tokens are only checked once: the distinct tokens are filtered and the result
+        is used as a lookup for the full list.
+        
+        Args:
+            tokens (List[str]): The tokens to filter.
+        
+        Returns:
+            List[str]: The tokens containing at least one Chinese character.
         """
-        if self.token_list is not None:
-            self.token_list = [word for word in self.token_list if self.helper(word)]
+        distinct = set(tokens)
+        if len(distinct) == len(tokens):
+            return list(filter(_ZH_TOKEN_RE.search, tokens))
+
+        keep = set(filter(_ZH_TOKEN_RE.search, distinct))
+        return [word for word in tokens if word in keep]
 
     def tokenize(self, text, is_unique: bool = True):
         """
@@ -224,19 +299,97 @@ class ChineseTokenizer:
         Returns:
             Tuple[int, int, List[str]]: Number of tokens, number of filtered tokens, and list of tokens.
         """
-        self.token_list: List[str] = []
-
         if not is_unique:
             print('The output will not contain unique words')
 
         if self.tokenizer == 'spacy':
-            num_tokens, num_unique_tokens, self.token_list = self._tokenize_with_spacy(text, is_unique) 
+            num_tokens, num_unique_tokens, tokens = self._tokenize_with_spacy(text, is_unique) 
 
         elif self.tokenizer == 'stanza':
-            num_tokens, num_unique_tokens, self.token_list = self._tokenize_with_stanza(text, is_unique)
+            num_tokens, num_unique_tokens, tokens = self._tokenize_with_stanza(text, is_unique)
+
+        else:
+            num_tokens, num_unique_tokens, tokens = self._tokenize_with_jieba(text, is_unique)
+
+        tokens = self.remove_non_zh_tokens(tokens)
+        return num_tokens, len(tokens), tokens
+
+    def tokenize_stream(self, texts: Iterable[str], is_unique: bool = True) -> Iterator[Tuple[int, int, List[str]]]:
+        """
+        Lazily tokenize a stream of texts and filter Chinese tokens from each of them.
+
+        Stanza and spaCy pull texts from the iterable in batches so they can process documents
+        together instead of running one mini-batch per text. Other tokenizers fall back to calling
+        tokenize per text. Only the current batch is held in memory, so corpora of any size can be
+        counted without materializing every token list.
+        
+        Args:
+            texts (Iterable[str]): The texts to tokenize.
+            is_unique (bool): Whether to return unique tokens.
+        
+        Yields:
+            Tuple[int, int, List[str]]: For each text, the number of tokens, number of filtered tokens, and list of tokens.
+        """
+        if self.tokenizer not in ('stanza', 'spacy'):
+            for text in texts:
+                yield self.tokenize(text, is_unique)
+            return
+
+        if not is_unique:
+            print('The output will not contain unique words')
+
+        if self.tokenizer == 'stanza':
+            docs = self.stanza_tokenizer.stream(stanza.Document([], text=text) for text in texts)
+            token_lists = ([word.text for sentence in doc.sentences for word in sentence.words] for doc in docs)
 
         else:
-            num_tokens, num_unique_tokens, self.token_list = self._tokenize_with_jieba(text, is_unique)
+            docs = self.spacy_tokenizer.pipe(texts, batch_size=256)
+            token_lists = ([token.text for token in doc] for doc in docs)
+
+        for tokens in token_lists:
+            words = self.remove_non_zh_tokens(self._finalize(tokens, is_unique)[2])
+            yield len(tokens), len(words), words
+
+    def bulk_tokenize(self, texts: List[str], is_unique: bool = True) -> List[Tuple[int, int, List[str]]]:
+        """
+        Tokenize many texts at once and filter Chinese tokens from each of them.
+
+        Collects the results of tokenize_stream into a list.
+        
+        Args:
+            texts (List[str]): The texts to tokenize.
+            is_unique (bool): Whether to return unique tokens.
+        
+        Returns:
+            List[Tuple[int, int, List[str]]]: For each text, the number of tokens, number of filtered tokens, and list of tokens.
+        """
+        return list(self.tokenize_stream(texts, is_unique))
+
+
+# Tokenizers built inside each worker process, keyed by (tokenizer, language)
+_TOKENIZERS: Dict[Tuple[str, str], ChineseTokenizer] = {}
+
+def tokenize_worker(args: Tuple[str, str, str]) -> Tuple[int, int, List[str]]:
+    """
+    Tokenize one text inside a multiprocessing worker, e.g. Pool.imap(tokenize_worker, jobs).
+
+    tokenize keeps no per-call state, so each worker builds its ChineseTokenizer once and reuses it
+    for every text it receives.
+    
+    Args:
+        args (Tuple[str, str, str]): The text, the tokenization method and the language code.
+    
+    Returns:
+        Tuple[int, int, List[str]]: Number of tokens, number of filtered tokens, and list of tokens.
+    """
+    text, tokenizer, language = args
+    key = (tokenizer, language)
+
+    if key not in _TOKENIZERS:
+        if tokenizer == 'stanza' and not STANZA_FAST_TOKENIZE:
+            # One torch thread per worker, otherwise every process starts a full OpenMP pool
+            import torch
+            torch.set_num_threads(1)
+        _TOKENIZERS[key] = ChineseTokenizer(language=language, tokenizer=tokenizer)
 
-        self.remove_non_zh_tokens()
-        return num_tokens, len(self.token_list), self.token_list
+    return _TOKENIZERS[key].tokenize(text)